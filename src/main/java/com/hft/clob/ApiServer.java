@@ -36,6 +36,8 @@ public class ApiServer {
         System.out.println("    POST http://localhost:8080/api/orders - Submit order");
         System.out.println("    GET  http://localhost:8080/api/trades - Recent trades");
         System.out.println("    GET  http://localhost:8080/api/stats  - Statistics");
+        System.out.println("    GET  http://localhost:8080/api/snapshot - Quote, book, stats and trades");
+        System.out.println("    GET  http://localhost:8080/api/stream - Snapshot push (server-sent events)");
         System.out.println("\n  Streamlit UI:");
         System.out.println("    Run: streamlit run ui/streamlit_app.py");
     }
@@ -5,9 +5,15 @@ import com.hft.clob.core.*;
 import com.hft.clob.engine.*;
 import io.javalin.Javalin;
 import io.javalin.http.Context;
+import io.javalin.http.sse.SseClient;
 
 import java.util.*;
+import java.util.concurrent.ConcurrentHashMap;
 import java.util.concurrent.ConcurrentLinkedQueue;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
 
 /**
  * REST API for CLOB using Javalin.
@@ -19,12 +25,24 @@ public class OrderBookController {
     private final Gson gson;
     private final Queue<TradeDTO> recentTrades;
     private final int maxRecentTrades = 100;
+    private final Map<SseClient, Integer> streamClients; // client -> trades limit
+    private final AtomicBoolean streamDirty;
+    private final ScheduledExecutorService streamPusher;
+    private static final long STREAM_PUSH_INTERVAL_MS = 200;
+    private static final long STREAM_HEARTBEAT_INTERVAL_MS = 5_000;
 
     public OrderBookController(MatchingEngine engine) {
         this.engine = engine;
         this.book = engine.getBook();
         this.gson = new Gson();
         this.recentTrades = new ConcurrentLinkedQueue<>();
+        this.streamClients = new ConcurrentHashMap<>();
+        this.streamDirty = new AtomicBoolean(false);
+        this.streamPusher = Executors.newSingleThreadScheduledExecutor(r -> {
+            Thread t = new Thread(r, "sse-pusher");
+            t.setDaemon(true);
+            return t;
+        });
     }
 
     /**
@@ -60,6 +78,18 @@ public class OrderBookController {
         // Get statistics
         app.get("/api/stats", this::getStats);
 
+        // Get quote, book, stats and trades in one response
+        app.get("/api/snapshot", this::getSnapshot);
+
+        // Push snapshots over server-sent events whenever the book changes
+        app.sse("/api/stream", this::openStream);
+
+        // All stream writes happen on the pusher thread, never on request threads
+        streamPusher.scheduleAtFixedRate(this::pushIfDirty,
+                STREAM_PUSH_INTERVAL_MS, STREAM_PUSH_INTERVAL_MS, TimeUnit.MILLISECONDS);
+        streamPusher.scheduleAtFixedRate(this::sendHeartbeat,
+                STREAM_HEARTBEAT_INTERVAL_MS, STREAM_HEARTBEAT_INTERVAL_MS, TimeUnit.MILLISECONDS);
+
         System.out.println("✓ REST API started on http://localhost:" + port);
         return app;
     }
@@ -68,6 +98,10 @@ public class OrderBookController {
      * Get order book snapshot (L2 depth).
      */
     private void getOrderBook(Context ctx) {
+        ctx.json(buildOrderBook());
+    }
+
+    private OrderBookSnapshot buildOrderBook() {
         OrderBookSnapshot snapshot = new OrderBookSnapshot();
 
         // Collect bids (price descending)
@@ -80,13 +114,17 @@ public class OrderBookController {
             snapshot.asks.add(new PriceLevel(price, level.getTotalQuantity(), level.getSize()));
         });
 
-        ctx.json(snapshot);
+        return snapshot;
     }
 
     /**
      * Get best bid/ask (L1 quote).
      */
     private void getQuote(Context ctx) {
+        ctx.json(buildQuote());
+    }
+
+    private QuoteDTO buildQuote() {
         QuoteDTO quote = new QuoteDTO();
         quote.bestBid = book.getBestBid();
         quote.bestAsk = book.getBestAsk();
@@ -95,7 +133,7 @@ public class OrderBookController {
             quote.spread = quote.bestAsk - quote.bestBid;
         }
 
-        ctx.json(quote);
+        return quote;
     }
 
     /**
@@ -144,6 +182,8 @@ public class OrderBookController {
         } catch (Exception e) {
             ctx.status(400).result("Invalid request: " + e.getMessage());
         }
+
+        streamDirty.set(true);
     }
 
     /**
@@ -162,19 +202,38 @@ public class OrderBookController {
         } catch (NumberFormatException e) {
             ctx.status(400).result("Invalid order ID");
         }
+
+        streamDirty.set(true);
     }
 
     /**
      * Get recent trades.
      */
     private void getTrades(Context ctx) {
-        ctx.json(new ArrayList<>(recentTrades));
+        ctx.json(lastTrades(tradesLimit(ctx, "limit")));
+    }
+
+    private int tradesLimit(Context ctx, String limitParam) {
+        return ctx.queryParamAsClass(limitParam, Integer.class).getOrDefault(maxRecentTrades);
+    }
+
+    /**
+     * Most recent trades, at most {@code limit} of them.
+     */
+    private List<TradeDTO> lastTrades(int limit) {
+        List<TradeDTO> trades = new ArrayList<>(recentTrades);
+        int from = Math.max(0, trades.size() - Math.max(0, limit));
+        return trades.subList(from, trades.size());
     }
 
     /**
      * Get system statistics.
      */
     private void getStats(Context ctx) {
+        ctx.json(buildStats());
+    }
+
+    private StatsDTO buildStats() {
         StatsDTO stats = new StatsDTO();
         stats.activeOrders = book.getIndex().size();
         stats.poolUtilization = book.getPool().capacity() - book.getPool().availableOrders();
@@ -183,7 +242,69 @@ public class OrderBookController {
         stats.askLevels = book.getAsks().size();
         stats.totalTrades = recentTrades.size();
 
-        ctx.json(stats);
+        return stats;
+    }
+
+    /**
+     * Get combined quote, book, stats and trades (one round trip per UI refresh).
+     */
+    private void getSnapshot(Context ctx) {
+        ctx.json(buildSnapshot(tradesLimit(ctx, "tradesLimit")));
+    }
+
+    private SnapshotDTO buildSnapshot(int tradesLimit) {
+        SnapshotDTO snapshot = new SnapshotDTO();
+        snapshot.quote = buildQuote();
+        snapshot.book = buildOrderBook();
+        snapshot.stats = buildStats();
+        snapshot.trades = lastTrades(tradesLimit);
+
+        return snapshot;
+    }
+
+    /**
+     * Subscribe to snapshot events (sent on connect and after book changes, plus heartbeats).
+     */
+    private void openStream(SseClient client) {
+        int limit = tradesLimit(client.ctx(), "tradesLimit");
+        client.keepAlive();
+        client.onClose(() -> streamClients.remove(client));
+        streamClients.put(client, limit);
+
+        // Initial snapshot goes out on the next push tick
+        streamDirty.set(true);
+    }
+
+    /**
+     * Push one coalesced snapshot to all subscribers if the book changed since the last push.
+     */
+    private void pushIfDirty() {
+        if (streamClients.isEmpty() || !streamDirty.getAndSet(false)) {
+            return;
+        }
+
+        try {
+            // Build and serialize once per distinct trades limit, not once per client.
+            // Javalin's mapper keeps the payload identical to GET /api/snapshot.
+            Map<Integer, String> payloads = new HashMap<>();
+            streamClients.forEach((client, limit) -> client.sendEvent("snapshot",
+                    payloads.computeIfAbsent(limit, l ->
+                            client.ctx().jsonMapper().toJsonString(buildSnapshot(l), SnapshotDTO.class))));
+        } catch (Exception e) {
+            // An exception would cancel the scheduled task; retry on the next tick
+            streamDirty.set(true);
+        }
+    }
+
+    /**
+     * Keep idle streams verifiably alive so clients can detect dead connections.
+     */
+    private void sendHeartbeat() {
+        try {
+            streamClients.keySet().forEach(client -> client.sendEvent("heartbeat", ""));
+        } catch (Exception e) {
+            // Keep the scheduled task alive
+        }
     }
 
     // DTOs
@@ -248,4 +369,11 @@ public class OrderBookController {
         public int askLevels;
         public int totalTrades;
     }
+
+    static class SnapshotDTO {
+        public QuoteDTO quote;
+        public OrderBookSnapshot book;
+        public StatsDTO stats;
+        public List<TradeDTO> trades;
+    }
 }
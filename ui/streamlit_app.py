@@ -1,14 +1,34 @@
 import streamlit as st
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import time
 import os
+import time
+import orjson
+import sseclient
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration - supports both local and deployed modes
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8080/api")
 
+# Fixed-point price scale (backend prices are in cents)
+PRICE_SCALE = 100.0
+
+# Number of recent trades shown in the trades table
+RECENT_TRADES_LIMIT = 10
+
+# Retry backoff for unreachable endpoints (seconds)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Server sends a stream heartbeat every 5s; treat longer silence as a dead stream
+STREAM_STALE_AFTER = 8.0
+
 st.set_page_config(
     page_title="CLOB Order Book Visualizer",
     page_icon="📊",
@@ -36,48 +56,179 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def fetch_data(endpoint):
-    """Fetch data from API."""
+@st.cache_resource
+def _http():
+    """HTTP session shared across reruns so keep-alive connections are reused."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def _pool():
+    """Thread pool shared across reruns for parallel API polls."""
+    return ThreadPoolExecutor(max_workers=4)
+
+@st.cache_resource
+def _backoff_state():
+    """Per-endpoint (next_allowed_ts, failures), shared across reruns."""
+    return {}, threading.Lock()
+
+def _fetch_raw(endpoint, session, backoff_state):
+    """Fetch (status_code, body) from API, backing off while it is unreachable.
+    
+    status_code is None when the request was skipped or failed to connect.
+    session and backoff_state come from _http() / _backoff_state(), resolved by
+    the caller on the script thread (pool workers have no ScriptRunContext).
+    """
+    backoff, lock = backoff_state
+    with lock:
+        next_allowed, _ = backoff.get(endpoint, (0.0, 0))
+    if time.monotonic() < next_allowed:
+        return None, None
+    
     try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}", timeout=2)
-        if response.status_code == 200:
-            return response.json()
+        response = session.get(f"{API_BASE_URL}/{endpoint}", timeout=2)
+        if response.status_code in (200, 404):
+            # 404 is a definite answer, not an outage - don't back off
+            with lock:
+                backoff.pop(endpoint, None)
+            return response.status_code, response.content
     except:
         pass
-    return None
+    
+    with lock:
+        _, failures = backoff.get(endpoint, (0.0, 0))
+        failures += 1
+        backoff[endpoint] = (time.monotonic() + min(BACKOFF_MAX, BACKOFF_BASE * 2 ** failures), failures)
+    return None, None
+
+def _decode(status, raw):
+    """Decode a 200 JSON body, or None."""
+    if status != 200:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # 200 with a non-JSON body (proxy page, HTML fallback)
+        return None
+
+def fetch_data(endpoint, session, backoff_state):
+    """Fetch data from API."""
+    return _decode(*_fetch_raw(endpoint, session, backoff_state))
+
+def fetch_all(endpoints=("quote", "book", "stats", f"trades?limit={RECENT_TRADES_LIMIT}")):
+    """Fetch several endpoints concurrently."""
+    executor = _pool()
+    session, backoff_state = _http(), _backoff_state()
+    futures = {
+        endpoint: executor.submit(fetch_data, endpoint, session, backoff_state)
+        for endpoint in endpoints
+    }
+    return tuple(futures[endpoint].result() for endpoint in endpoints)
+
+def _listen_stream(session, state):
+    """Keep state["snapshot"] updated from the server-sent event stream, reconnecting with backoff."""
+    failures = 0
+    while True:
+        try:
+            response = session.get(
+                f"{API_BASE_URL}/stream?tradesLimit={RECENT_TRADES_LIMIT}",
+                stream=True,
+                timeout=(2, STREAM_STALE_AFTER)
+            )
+            response.raise_for_status()
+            failures = 0
+            for event in sseclient.SSEClient(response.iter_content(chunk_size=None)).events():
+                state["last_event"] = time.monotonic()
+                if event.event == "snapshot":
+                    state["snapshot"] = orjson.loads(event.data)
+                    state["connected"] = True
+        except Exception:
+            pass
+        
+        state["connected"] = False
+        failures += 1
+        time.sleep(min(BACKOFF_MAX, BACKOFF_BASE * 2 ** failures))
+
+@st.cache_resource
+def _stream_state():
+    """Latest pushed snapshot, shared by all sessions (one listener per server process)."""
+    state = {"snapshot": None, "connected": False, "last_event": 0.0}
+    threading.Thread(target=_listen_stream, args=(_http(), state), daemon=True).start()
+    return state
+
+def fetch_snapshot(fresh=False):
+    """Get quote, book, stats and trades - from the push stream, else in a single request.
+    
+    fresh=True bypasses the stream (its last push may predate the user's own order).
+    """
+    stream = _stream_state()
+    # Read-only check - connected is owned by the listener thread
+    live = stream["connected"] and time.monotonic() - stream["last_event"] <= STREAM_STALE_AFTER
+    if live and not fresh:
+        snapshot = stream["snapshot"]
+    else:
+        status, raw = _fetch_raw(f"snapshot?tradesLimit={RECENT_TRADES_LIMIT}", _http(), _backoff_state())
+        if status == 404:
+            # Older backend without /snapshot - fall back to per-endpoint polls
+            return fetch_all()
+        snapshot = _decode(status, raw)
+    if snapshot is None:
+        return None, None, None, None
+    return snapshot.get("quote"), snapshot.get("book"), snapshot.get("stats"), snapshot.get("trades")
 
 def submit_order(side, price, quantity):
     """Submit order to the order book."""
     try:
         payload = {
             "side": side,
-            "price": int(price * 100),  # Convert to fixed-point
+            "price": int(price * PRICE_SCALE),  # Convert to fixed-point
             "quantity": quantity
         }
-        response = requests.post(f"{API_BASE_URL}/orders", json=payload, timeout=2)
-        return response.status_code == 200, response.json() if response.status_code == 200 else None
+        response = _http().post(f"{API_BASE_URL}/orders", json=payload, timeout=2)
+        return response.status_code == 200, orjson.loads(response.content) if response.status_code == 200 else None
     except Exception as e:
         return False, str(e)
 
-def format_price(price_fp):
-    """Convert fixed-point price to decimal."""
-    return price_fp / 100.0
-
-def create_depth_chart(bids, asks):
-    """Create depth chart visualization."""
+@st.cache_resource
+def _depth_layout():
+    """Depth chart layout, built once per server process (treat as read-only)."""
     fig = make_subplots(
         rows=1, cols=1,
         subplot_titles=["Order Book Depth"]
     )
+    fig.update_layout(
+        height=400,
+        xaxis_title="Price ($)",
+        yaxis_title="Cumulative Quantity",
+        hovermode='x unified',
+        showlegend=True,
+        template='plotly_white'
+    )
+    return fig.to_dict()["layout"]
+
+def _depth_series(levels):
+    """Return (prices, cumulative quantities) arrays for one side of the book."""
+    prices = np.fromiter((lvl['price'] for lvl in levels), dtype=np.int64, count=len(levels)) / PRICE_SCALE
+    qtys = np.fromiter((lvl['quantity'] for lvl in levels), dtype=np.int64, count=len(levels))
+    # Prefix-sum in place - no second int64 array per side
+    return prices, np.cumsum(qtys, out=qtys)
+
+def create_depth_chart(bids, asks):
+    """Create depth chart visualization."""
+    traces = []
     
     if bids:
-        bid_df = pd.DataFrame(bids)
-        bid_df['price_decimal'] = bid_df['price'].apply(format_price)
-        bid_df['cumulative_qty'] = bid_df['quantity'].cumsum()
-        
-        fig.add_trace(go.Scatter(
-            x=bid_df['price_decimal'],
-            y=bid_df['cumulative_qty'],
+        bid_prices, bid_cum = _depth_series(bids)
+        traces.append(go.Scatter(
+            x=bid_prices,
+            y=bid_cum,
             fill='tozeroy',
             name='Bids',
             line=dict(color='#00C805', width=2),
@@ -85,41 +236,61 @@ def create_depth_chart(bids, asks):
         ))
     
     if asks:
-        ask_df = pd.DataFrame(asks)
-        ask_df['price_decimal'] = ask_df['price'].apply(format_price)
-        ask_df['cumulative_qty'] = ask_df['quantity'].cumsum()
-        
-        fig.add_trace(go.Scatter(
-            x=ask_df['price_decimal'],
-            y=ask_df['cumulative_qty'],
+        ask_prices, ask_cum = _depth_series(asks)
+        traces.append(go.Scatter(
+            x=ask_prices,
+            y=ask_cum,
             fill='tozeroy',
             name='Asks',
             line=dict(color='#FF3333', width=2),
             fillcolor='rgba(255, 51, 51, 0.3)'
         ))
     
-    fig.update_layout(
-        height=400,
-        xaxis_title="Price ($)",
-        yaxis_title="Cumulative Quantity",
-        hovermode='x unified',
-        showlegend=True,
-        template='plotly_white'
-    )
-    
-    return fig
+    # Figure copies the layout, so the cached dict is never mutated
+    return go.Figure(data=traces, layout=_depth_layout())
 
 def create_order_book_table(levels, side):
-    """Create order book table for bids or asks."""
+    """Create order book table (top 15 levels) for bids or asks."""
     if not levels:
-        return pd.DataFrame()
+        return None
     
-    df = pd.DataFrame(levels)
-    df['Price'] = df['price'].apply(format_price)
-    df['Quantity'] = df['quantity']
-    df['Orders'] = df['orders']
+    top = levels[:15]
+    return {
+        "Price": [lvl['price'] / PRICE_SCALE for lvl in top],
+        "Quantity": [lvl['quantity'] for lvl in top],
+        "Orders": [lvl['orders'] for lvl in top],
+    }
+
+def create_trades_table(trades):
+    """Create recent trades table."""
+    if not trades:
+        return None
     
-    return df[['Price', 'Quantity', 'Orders']]
+    last_trades = trades[-RECENT_TRADES_LIMIT:]  # Get most recent trades
+    return {
+        "Buy Order ID": [f"{t['buyOrderId']:,}" for t in last_trades],
+        "Sell Order ID": [f"{t['sellOrderId']:,}" for t in last_trades],
+        "Price ($)": [f"${t['price'] / PRICE_SCALE:.2f}" for t in last_trades],
+        "Qty": [int(t['quantity']) for t in last_trades],
+    }
+
+def build_views(book, trades):
+    """Build chart and table data, reusing the last build if book and trades are unchanged."""
+    digest = hashlib.blake2b(orjson.dumps(book) + orjson.dumps(trades), digest_size=8).digest()
+    last = st.session_state.get("last_views")
+    if last is not None and last[0] == digest:
+        return last[1]
+    
+    bids = book.get('bids', []) if book else []
+    asks = book.get('asks', []) if book else []
+    views = {
+        "depth_chart": create_depth_chart(bids, asks),
+        "bid_table": create_order_book_table(bids, 'BUY'),
+        "ask_table": create_order_book_table(asks, 'SELL'),
+        "trades_table": create_trades_table(trades),
+    }
+    st.session_state["last_views"] = (digest, views)
+    return views
 
 # Title
 st.title("📊 High-Performance CLOB Order Book")
@@ -129,13 +300,18 @@ st.markdown("Real-time visualization of concurrent limit order book")
 with st.sidebar:
     st.header("📝 Submit Order")
     
-    order_side = st.radio("Side", ["BUY", "SELL"])
-    order_price = st.number_input("Price ($)", min_value=0.01, value=105.00, step=0.01, format="%.2f")
-    order_quantity = st.number_input("Quantity", min_value=1, value=100, step=10)
+    # Form batches widget edits so typing doesn't rerun the script
+    with st.form("order_form", clear_on_submit=False, border=False):
+        order_side = st.radio("Side", ["BUY", "SELL"])
+        order_price = st.number_input("Price ($)", min_value=0.01, value=105.00, step=0.01, format="%.2f")
+        order_quantity = st.number_input("Quantity", min_value=1, value=100, step=10)
+        submitted = st.form_submit_button("Submit Order", type="primary", use_container_width=True)
     
-    if st.button("Submit Order", type="primary", use_container_width=True):
+    if submitted:
         success, result = submit_order(order_side, order_price, order_quantity)
         if success:
+            # Show the book including this order rather than the last push
+            st.session_state["fresh_snapshot"] = True
             st.success(f"✅ Order {result.get('status', 'SUBMITTED')}")
             if result.get('tradesCount', 0) > 0:
                 st.info(f"🔄 {result['tradesCount']} trade(s) executed")
@@ -151,137 +327,124 @@ if auto_refresh:
     refresh_interval = st.sidebar.slider("Refresh interval (s)", 1, 10, 2, key="refresh_slider")
 
 
-# Main content
-quote = fetch_data("quote")
-book = fetch_data("book")
-stats = fetch_data("stats")
+# Main content - re-executed on its own every refresh interval when auto-refresh is on;
+# while the stream is connected a tick only reads the latest pushed snapshot
+@st.fragment(run_every=refresh_interval if auto_refresh else None)
+def live_panel():
+    """Fetch the latest snapshot and render metrics, charts and tables."""
+    quote, book, stats, trades = fetch_snapshot(fresh=st.session_state.pop("fresh_snapshot", False))
 
-# Check if backend is available
-if quote is None and book is None and stats is None:
-    st.error("⚠️ **Backend API is not available**")
-    st.info(f"""
-    The Streamlit UI is trying to connect to: `{API_BASE_URL}`
+    # Check if backend is available
+    if quote is None and book is None and stats is None:
+        st.error("⚠️ **Backend API is not available**")
+        st.info(f"""
+        The Streamlit UI is trying to connect to: `{API_BASE_URL}`
     
-    **For local development:**
-    - Make sure the Java backend is running: `./gradlew runApiServer`
+        **For local development:**
+        - Make sure the Java backend is running: `./gradlew runApiServer`
     
-    **For deployment:**
-    - Deploy the Java backend separately (e.g., to Render, Railway, or Heroku)
-    - Set the `API_BASE_URL` environment variable in Streamlit Cloud settings
-    """)
-    st.stop()
+        **For deployment:**
+        - Deploy the Java backend separately (e.g., to Render, Railway, or Heroku)
+        - Set the `API_BASE_URL` environment variable in Streamlit Cloud settings
+        """)
+        return
 
+    views = build_views(book, trades)
 
-# Top metrics
-if quote:
-    col1, col2, col3 = st.columns(3)
+    # Top metrics
+    if quote:
+        col1, col2, col3 = st.columns(3)
     
-    with col1:
-        best_bid = format_price(quote['bestBid']) if quote.get('bestBid') else 0
-        st.metric("Best Bid", f"${best_bid:.2f}", delta=None, delta_color="normal")
+        with col1:
+            best_bid = quote['bestBid'] / PRICE_SCALE if quote.get('bestBid') else 0
+            st.metric("Best Bid", f"${best_bid:.2f}", delta=None, delta_color="normal")
     
-    with col2:
-        best_ask = format_price(quote['bestAsk']) if quote.get('bestAsk') else 0
-        st.metric("Best Ask", f"${best_ask:.2f}", delta=None, delta_color="inverse")
+        with col2:
+            best_ask = quote['bestAsk'] / PRICE_SCALE if quote.get('bestAsk') else 0
+            st.metric("Best Ask", f"${best_ask:.2f}", delta=None, delta_color="inverse")
     
-    with col3:
-        spread = format_price(quote['spread']) if quote.get('spread') else 0
-        spread_bps = (spread / best_ask * 10000) if best_ask > 0 else 0
-        st.metric("Spread", f"${spread:.2f}", f"{spread_bps:.1f} bps")
+        with col3:
+            spread = quote['spread'] / PRICE_SCALE if quote.get('spread') else 0
+            spread_bps = (spread / best_ask * 10000) if best_ask > 0 else 0
+            st.metric("Spread", f"${spread:.2f}", f"{spread_bps:.1f} bps")
 
-st.divider()
+    st.divider()
 
-# Main visualization
-if book:
-    bids = book.get('bids', [])
-    asks = book.get('asks', [])
+    # Main visualization
+    if book:
+        # Depth chart
+        st.subheader("📈 Order Book Depth Chart")
+        st.plotly_chart(views["depth_chart"], use_container_width=True)
     
-    # Depth chart
-    st.subheader("📈 Order Book Depth Chart")
-    depth_chart = create_depth_chart(bids, asks)
-    st.plotly_chart(depth_chart, use_container_width=True)
+        st.divider()
     
-    st.divider()
+        # Order book tables
+        col1, col2 = st.columns(2)
     
-    # Order book tables
-    col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("💚 Bids (Buy Orders)")
+            bid_table = views["bid_table"]
+            if bid_table is not None:
+                st.dataframe(
+                    bid_table,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
+            else:
+                st.info("No bids in the order book")
     
-    with col1:
-        st.subheader("💚 Bids (Buy Orders)")
-        bid_df = create_order_book_table(bids, 'BUY')
-        if not bid_df.empty:
-            st.dataframe(
-                bid_df.head(15),
-                use_container_width=True,
-                hide_index=True,
-                height=400
-            )
-        else:
-            st.info("No bids in the order book")
-    
-    with col2:
-        st.subheader("❤️ Asks (Sell Orders)")
-        ask_df = create_order_book_table(asks, 'SELL')
-        if not ask_df.empty:
-            st.dataframe(
-                ask_df.head(15),
-                use_container_width=True,
-                hide_index=True,
-                height=400
-            )
-        else:
-            st.info("No asks in the order book")
+        with col2:
+            st.subheader("❤️ Asks (Sell Orders)")
+            ask_table = views["ask_table"]
+            if ask_table is not None:
+                st.dataframe(
+                    ask_table,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
+            else:
+                st.info("No asks in the order book")
 
-st.divider()
+    st.divider()
 
-# Statistics
-if stats:
-    st.subheader("📊 System Statistics")
-    col1, col2, col3, col4 = st.columns(4)
+    # Statistics
+    if stats:
+        st.subheader("📊 System Statistics")
+        col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.metric("Active Orders", stats.get('activeOrders', 0))
+        with col1:
+            st.metric("Active Orders", stats.get('activeOrders', 0))
     
-    with col2:
-        pool_util = stats.get('poolUtilization', 0)
-        pool_cap = stats.get('poolCapacity', 100000)
-        util_pct = (pool_util / pool_cap * 100) if pool_cap > 0 else 0
-        st.metric("Pool Usage", f"{pool_util:,}", f"{util_pct:.2f}%")
+        with col2:
+            pool_util = stats.get('poolUtilization', 0)
+            pool_cap = stats.get('poolCapacity', 100000)
+            util_pct = (pool_util / pool_cap * 100) if pool_cap > 0 else 0
+            st.metric("Pool Usage", f"{pool_util:,}", f"{util_pct:.2f}%")
     
-    with col3:
-        st.metric("Bid Levels", stats.get('bidLevels', 0))
+        with col3:
+            st.metric("Bid Levels", stats.get('bidLevels', 0))
     
-    with col4:
-        st.metric("Ask Levels", stats.get('askLevels', 0))
-
-# Recent trades
-trades = fetch_data("trades")
-if trades and len(trades) > 0:
-    st.subheader("🔄 Recent Trades")
-    trades_df = pd.DataFrame(trades)
-    
-    # Format the data properly
-    trades_df = trades_df.tail(10).copy()  # Get last 10 trades
-    trades_df['Buy Order ID'] = trades_df['buyOrderId'].apply(lambda x: f"{x:,}")
-    trades_df['Sell Order ID'] = trades_df['sellOrderId'].apply(lambda x: f"{x:,}")
-    trades_df['Price ($)'] = trades_df['price'].apply(lambda x: f"${x/100:.2f}")
-    trades_df['Qty'] = trades_df['quantity'].astype(int)
+        with col4:
+            st.metric("Ask Levels", stats.get('askLevels', 0))
+
+    # Recent trades
+    if views["trades_table"] is not None:
+        st.subheader("🔄 Recent Trades")
     
-    # Display the formatted table
-    st.dataframe(
-        trades_df[['Buy Order ID', 'Sell Order ID', 'Price ($)', 'Qty']],
-        use_container_width=True,
-        hide_index=True
-    )
-else:
-    st.info("No trades executed yet. Submit orders to see trades appear here.")
+        # Display the formatted table
+        st.dataframe(
+            views["trades_table"],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No trades executed yet. Submit orders to see trades appear here.")
+
 
+live_panel()
 
 # Footer
 st.divider()
 st.caption("High-Performance Concurrent Limit Order Book • Built with Java + Streamlit")
-
-# Auto-refresh
-if auto_refresh:
-    time.sleep(refresh_interval)
-    st.rerun()